@@ -1,6 +1,14 @@
 const Pty = require('node-pty');
 const fs = require('fs');
 
+// Terminal output is sent in frames of up to FRAME_SIZE characters, at most FRAME_DELAY ms
+// after it was produced, instead of one websocket message per pty chunk
+const FRAME_SIZE = 16384;
+const FRAME_DELAY = 10;
+
+// The pty is paused while this many bytes are still waiting to be sent to the browser
+const HIGH_WATER = 1024 * 1024;
+
 exports.install = function () {
 
     ROUTE('/');
@@ -21,22 +29,32 @@ function socket() {
             cols: 80,
             rows: 24,
             cwd: process.env.PWD,
-            env: process.env
+            env: Object.assign({}, process.env, { screen_mode: '1' })
         });
+        client.pending = '';
+        client.timer = null;
+        client.paused = false;
 
         client.tty.on('exit', function (code, signal) {
+            flush(client);
             client.tty = null;
             client.close();
             console.log("Process killed");
         });
 
         client.tty.on('data', function (data) {
-            client.send(data);
+            client.pending += data;
+            if (client.pending.length >= FRAME_SIZE)
+                flush(client);
+            else if (!client.timer)
+                client.timer = setTimeout(flush, FRAME_DELAY, client);
         });
 
     });
 
     this.on('close', function (client) {
+        clearTimeout(client.timer);
+        client.timer = null;
         if (client.tty) {
             client.tty.kill(9);
             client.tty = null;
@@ -49,6 +67,37 @@ function socket() {
     });
 }
 
+// Sends the buffered output as one frame and pauses the pty if the browser falls behind
+function flush(client) {
+    clearTimeout(client.timer);
+    client.timer = null;
+
+    if (!client.pending)
+        return;
+
+    // A single large pty chunk can exceed FRAME_SIZE, so it is split over several frames
+    var pending = client.pending;
+    client.pending = '';
+    while (pending) {
+        var size = Math.min(FRAME_SIZE, pending.length);
+        var code = pending.charCodeAt(size - 1);
+        if (size < pending.length && code >= 0xD800 && code <= 0xDBFF)
+            size--;  // Don't split a surrogate pair between frames
+        client.send(pending.substring(0, size));
+        pending = pending.substring(size);
+    }
+
+    var raw = client.socket;
+    if (client.tty && !client.paused && raw && raw.writableLength > HIGH_WATER) {
+        client.paused = true;
+        client.tty.pause();
+        raw.once('drain', function () {
+            client.paused = false;
+            client.tty && client.tty.resume();
+        });
+    }
+}
+
 if (process.env.CREDS != null) {
     console.log("Creating creds.json file.");
     fs.writeFile('creds.json', process.env.CREDS, 'utf8', function (err) {
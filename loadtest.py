@@ -0,0 +1,300 @@
+# Load test for the web terminal: starts the Node server locally against a local
+# stand-in sheet, opens many websocket sessions at once and drives the menu in each.
+#
+# Usage: python3 loadtest.py --sessions 20 --rounds 3
+# Needs the Node dependencies installed (npm install) and the Python requirements.
+
+from concurrent.futures import ThreadPoolExecutor
+from prettytable import PrettyTable
+import argparse
+import base64
+import json
+import os
+import random
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+MENU_PROMPT = "Choose an option: "
+PAGER_PROMPT = "[q] quit: "  # Shown when long output is paged in screen mode
+HEADERS = ["Name", "Task", "Date", "Hours", "Type", "Recorded At"]
+NAMES = ["Anna", "Marco", "Giulia", "Luca"]
+TASKS = ["Invoice for client", "Newsletter draft", "Product roadmap", "Team meeting"]
+TYPES = ["Administrative", "Marketing", "Product"]
+
+# Scripted menu flows: each step waits for a prompt, then types an answer
+FLOWS = {
+    "log": [
+        (MENU_PROMPT, "1"),
+        ("Enter your name: ", "Anna"),
+        ("Enter the task: ", "Load test entry"),
+        ("today's date: ", ""),
+        ("Enter hours worked: ", "1.5"),
+        ("task type: ", "1"),
+    ],
+    "view": [
+        (MENU_PROMPT, "2"),
+    ],
+    "stats": [
+        (MENU_PROMPT, "4"),
+        ("your choice: ", "1"),
+    ],
+}
+
+
+# Function to write a local sheet file with some seeded entries. The first entry is
+# always Anna's, so the log flow never meets the new collaborator prompt.
+def create_local_sheet(path, rows):
+    today = time.localtime()
+    data = [HEADERS]
+    for i in range(max(rows, 1)):
+        day = random.randint(1, 28)
+        month = (today.tm_mon - 1 - i % 6) % 12 + 1
+        year = today.tm_year if month <= today.tm_mon else today.tm_year - 1
+        data.append([
+            NAMES[0] if i == 0 else random.choice(NAMES), random.choice(TASKS), f"{day:02d}-{month:02d}-{year}",
+            random.choice([1, 2, 2.5, 4, 8]), random.choice(TYPES), "01-01-2024 09:00:00",
+        ])
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+# Function to start the Node server and wait until it accepts connections
+def start_server(port, sheet_path):
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    # The terminal bridge starts run.py in process.env.PWD, so it must point here too
+    env = dict(os.environ, PORT=str(port), local_sheet=sheet_path, PWD=repo_dir)
+    server = subprocess.Popen(
+        ["node", "index.js"], cwd=repo_dir, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            sys.exit("The server exited during startup. Did you run npm install?")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    sys.exit("The server did not start within 30 seconds.")
+
+
+# Minimal websocket client, enough to talk to the terminal bridge
+class WebSocketSession:
+    def __init__(self, port, timeout):
+        self.sock = socket.create_connection(("127.0.0.1", port), timeout=timeout)
+        key = base64.b64encode(os.urandom(16)).decode()
+        self.sock.sendall((
+            "GET / HTTP/1.1\r\n"
+            f"Host: 127.0.0.1:{port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        ).encode())
+
+        response = b""
+        while b"\r\n\r\n" not in response:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                raise ConnectionError("Connection closed during the websocket handshake")
+            response += chunk
+        header, self.buffer = response.split(b"\r\n\r\n", 1)
+        if b" 101 " not in header.split(b"\r\n")[0]:
+            raise ConnectionError(f"Websocket upgrade refused: {header.splitlines()[0]!r}")
+        self.output = ""
+
+    def _read_exact(self, size):
+        while len(self.buffer) < size:
+            chunk = self.sock.recv(65536)
+            if not chunk:
+                raise ConnectionError("Connection closed by the server")
+            self.buffer += chunk
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def _read_frame(self):
+        first, second = self._read_exact(2)
+        opcode, length = first & 0x0F, second & 0x7F
+        if length == 126:
+            length = struct.unpack(">H", self._read_exact(2))[0]
+        elif length == 127:
+            length = struct.unpack(">Q", self._read_exact(8))[0]
+        payload = self._read_exact(length)
+        if opcode == 0x8:
+            raise ConnectionError("The server closed the websocket")
+        if opcode == 0x9:
+            self._send_frame(0xA, payload)
+            return ""
+        return payload.decode("utf-8", errors="replace")
+
+    def _send_frame(self, opcode, payload):
+        mask = os.urandom(4)
+        header = bytes([0x80 | opcode])
+        if len(payload) < 126:
+            header += bytes([0x80 | len(payload)])
+        elif len(payload) < 65536:
+            header += bytes([0x80 | 126]) + struct.pack(">H", len(payload))
+        else:
+            header += bytes([0x80 | 127]) + struct.pack(">Q", len(payload))
+        masked = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+        self.sock.sendall(header + mask + masked)
+
+    def send(self, text):
+        self._send_frame(0x1, text.encode())
+
+    def expect(self, text):
+        return self.expect_any([text])
+
+    def expect_any(self, texts):
+        # Read output until one of the texts appears, then drop everything up to it
+        while True:
+            found = [(self.output.find(text), text) for text in texts if text in self.output]
+            if found:
+                text = min(found)[1]
+                self.output = self.output.split(text, 1)[1]
+                return text
+            self.output += self._read_frame()
+
+    def close(self):
+        try:
+            self._send_frame(0x8, b"")
+        except OSError:
+            pass
+        self.sock.close()
+
+
+# Function to run one session: connect, then run every flow for a number of rounds
+def run_session(port, rounds, timeout, results):
+    start = time.monotonic()
+    try:
+        session = WebSocketSession(port, timeout)
+        session.expect(MENU_PROMPT)
+        session.output = MENU_PROMPT  # The first flow waits for this prompt
+        results["connect"].append(time.monotonic() - start)
+
+        for _ in range(rounds):
+            for flow, steps in FLOWS.items():
+                flow_start = time.monotonic()
+                for prompt, answer in steps:
+                    session.expect(prompt)
+                    session.send(answer + "\r")
+                # Leave the pager if the flow's output was long enough to be paged
+                while session.expect_any([MENU_PROMPT, PAGER_PROMPT]) == PAGER_PROMPT:
+                    session.send("q\r")
+                session.output = MENU_PROMPT
+                results[flow].append(time.monotonic() - flow_start)
+
+        results["finished"].append(session)
+        results["ready"].wait()  # Stay connected until memory has been measured
+        session.close()
+    except Exception as e:
+        results["errors"].append(str(e))
+        results["finished"].append(None)
+
+
+# Function to find the Python processes spawned (directly or not) by the server
+def session_processes(server_pid):
+    parents = {}
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        fields = stat.rsplit(")", 1)[1].split()
+        parents[int(pid)] = (int(fields[1]), stat.split("(", 1)[1].rsplit(")", 1)[0])
+
+    descendants, pending = [], [server_pid]
+    while pending:
+        parent = pending.pop()
+        for pid, (ppid, name) in parents.items():
+            if ppid == parent:
+                pending.append(pid)
+                if name.startswith("python"):
+                    descendants.append(pid)
+    return descendants
+
+
+# Function to read the resident memory of a process in MB
+def rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+# Helper function to pick a percentile from a list of timings
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the web terminal with many sessions.")
+    parser.add_argument("--sessions", type=int, default=10, help="simultaneous websocket sessions")
+    parser.add_argument("--rounds", type=int, default=1, help="times each session runs log, view and stats")
+    parser.add_argument("--rows", type=int, default=500, help="entries seeded into the local sheet (at least 1)")
+    parser.add_argument("--port", type=int, default=8100, help="port for the local server")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds to wait for any single reply")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="loadtest-")
+    sheet_path = os.path.join(workdir, "sheet.json")
+    create_local_sheet(sheet_path, args.rows)
+    server = start_server(args.port, sheet_path)
+    server_rss = rss_mb(server.pid)
+
+    results = {flow: [] for flow in FLOWS}
+    results.update(connect=[], errors=[], finished=[], ready=threading.Event())
+    wall_start = time.monotonic()
+    try:
+        with ThreadPoolExecutor(max_workers=args.sessions) as executor:
+            for _ in range(args.sessions):
+                executor.submit(run_session, args.port, args.rounds, args.timeout, results)
+
+            # Measure memory once every session has finished its flows (or failed)
+            while len(results["finished"]) < args.sessions:
+                time.sleep(0.2)
+            sessions = session_processes(server.pid)
+            session_rss = [rss_mb(pid) for pid in sessions]
+            node_rss = rss_mb(server.pid)
+            results["ready"].set()
+        wall_time = time.monotonic() - wall_start
+    finally:
+        results["ready"].set()
+        server.kill()
+        server.wait()
+
+    table = PrettyTable()
+    table.title = f"{args.sessions} sessions x {args.rounds} rounds, {args.rows} rows"
+    table.field_names = ["Measure", "Count", "p50", "p90", "p99", "Max"]
+    for name in ["connect"] + list(FLOWS):
+        timings = results[name]
+        if timings:
+            table.add_row([name, len(timings)] + [
+                f"{percentile(timings, fraction) * 1000:.0f}ms" for fraction in (0.5, 0.9, 0.99, 1.0)
+            ])
+    print(table)
+
+    print(f"\nWall time: {wall_time:.2f}s")
+    print(f"Node server RSS: {server_rss:.1f}MB idle, {node_rss:.1f}MB with sessions open")
+    if session_rss:
+        print(f"Python RSS per session: {sum(session_rss) / len(session_rss):.1f}MB average, "
+              f"{max(session_rss):.1f}MB max, {sum(session_rss):.1f}MB total over {len(session_rss)} processes")
+    if results["errors"]:
+        print(f"\n{len(results['errors'])} sessions failed, first error: {results['errors'][0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,140 @@
 import gspread
+from gspread.utils import numericise_all, rowcol_to_a1
 from google.oauth2.service_account import Credentials
 from datetime import datetime
+from bisect import bisect_left, insort
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import calendar
+import csv
+import fcntl
+import gzip
+import hashlib
+import html
 import json
+import multiprocessing
 import os
+import re
+import shutil
+import sys
+import threading
+import time
 from prettytable import PrettyTable
 
 
 # Google Sheets Setup
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
-CREDS_INFO = json.loads(os.environ['creds'])  # Decodes the environment variable
 SPREADSHEET_ID = "1jNF9dM8jqkJBCoWkHhPYtRDOtXTDtGt6Omdq5cZpX8U"  # Update with your Google Sheets ID
 SHEET_NAME = "Foglio1"  # Name of the sheet
 
+# Spreadsheets aggregated for company-wide reports, one entry per team.
+# Set the "sources" environment variable to a JSON list such as
+# [{"team": "Sales", "id": "<spreadsheet id>", "sheet": "Foglio1"}]
+SOURCES = json.loads(os.environ.get('sources', '[]')) or [
+    {"team": "Main", "id": SPREADSHEET_ID, "sheet": SHEET_NAME}
+]
+CACHE_SECONDS = 60  # How long fetched records are reused before checking the sheet for changes
+FULL_REFRESH_SECONDS = 600  # Refetch everything at least this often, to pick up edits to old rows
+PROBE_ROWS = 50  # Rows read past the cached end when checking for changes
+MONTHS_SHOWN = 12  # Number of most recent months with data offered in the month menu
+MAX_HOURS_PER_DAY = 24  # More hours than this for one person on one date is flagged
+EARLIEST_DATE = datetime(2000, 1, 1)  # Entries can't be dated before this or in the future
+
+# Local archive for entries moved out of the live worksheet
+ARCHIVE_DIR = "archive"
+ARCHIVE_ENTRIES_FILE = os.path.join(ARCHIVE_DIR, "entries.jsonl.gz")  # Every archived row
+ARCHIVE_SUMMARY_FILE = os.path.join(ARCHIVE_DIR, "monthly_summary.json")  # Totals per month
+ARCHIVE_MONTHS = 12  # Default horizon: entries dated before the last 12 months are archived
+
+# Set the "local_sheet" environment variable to a JSON file path to use a local
+# stand-in for the Google Sheet (for tests and local runs, no credentials needed)
+LOCAL_SHEET_FILE = os.environ.get('local_sheet')
+API_PORT = 8001  # Default port of the statistics JSON API (python3 run.py serve [port])
+REPORTS_DIR = "reports"  # Output of the batch monthly reports (python3 run.py reports [YYYY-MM ...])
+
+# Monthly hour budgets per task type and per collaborator. Set the "budgets" environment
+# variable to JSON such as {"types": {"Marketing": 40}, "collaborators": {"Anna": 120}}
+BUDGETS = json.loads(os.environ.get('budgets', '{}'))
+BUDGET_WARNING = 0.8  # Warn when this share of a budget has been used
+
+# Screen mode (set the "screen_mode" environment variable to 1) pages long output inside
+# the 80x24 deployment terminal and only redraws the lines that changed
+SCREEN_MODE = os.environ.get('screen_mode') == '1'
+SCREEN_COLS = 80
+SCREEN_ROWS = 24
+
+
+# Local stand-in for a gspread worksheet, storing all rows (headers first) in a JSON file
+class LocalSheet:
+    def __init__(self, path):
+        self.path = path
+        self.lock_path = path + ".lock"
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path) as f:
+            return json.load(f)
+
+    def _modify(self, change):
+        # Several processes may share the file, so changes are made under a file lock
+        with open(self.lock_path, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            rows = self._read()
+            change(rows)
+            with open(self.path + ".tmp", "w") as f:
+                json.dump(rows, f)
+            os.replace(self.path + ".tmp", self.path)
+
+    def get_all_values(self, value_render_option=None):
+        return self._read()  # Values are stored exactly as written, there is no formatting
+
+    def get(self, range_name):
+        match = re.fullmatch(r"[A-Z]+(\d+):([A-Z]+)(\d+)", range_name)  # Only A<row>:<col><row> ranges
+        columns = sum((ord(letter) - 64) * 26 ** i for i, letter in enumerate(reversed(match.group(2))))
+        rows = [row[:columns] for row in self._read()[int(match.group(1)) - 1:int(match.group(3))]]
+        while rows and not any(value != "" for value in rows[-1]):
+            rows.pop()  # Like the Sheets API, trailing empty rows are left out
+        return rows
+
+    def get_all_records(self):
+        rows = self._read()
+        if not rows:
+            return []
+        return [dict(zip(rows[0], row)) for row in rows[1:]]
+
+    def append_row(self, values):
+        self._modify(lambda rows: rows.append(list(values)))
+
+    def update(self, range_name, values):
+        start = int(re.sub(r"[A-Z]", "", range_name)) - 1  # Only whole rows from column A
+
+        def change(rows):
+            rows.extend([] for _ in range(start + len(values) - len(rows)))
+            rows[start:start + len(values)] = [list(row) for row in values]
+        self._modify(change)
+
+    def delete_rows(self, start_index, end_index=None):
+        end_index = end_index or start_index
+
+        def change(rows):
+            del rows[start_index - 1:end_index]
+        self._modify(change)
+
+
 print("Welcome to the Task Logger Program!")
 
 # Authorize and open the sheet
-creds = Credentials.from_service_account_info(CREDS_INFO, scopes=SCOPES)
-client = gspread.authorize(creds)
-sheet = client.open_by_key(SPREADSHEET_ID).worksheet(SHEET_NAME)
+if LOCAL_SHEET_FILE:
+    client = None
+    sheet = LocalSheet(LOCAL_SHEET_FILE)
+else:
+    CREDS_INFO = json.loads(os.environ['creds'])  # Decodes the environment variable
+    creds = Credentials.from_service_account_info(CREDS_INFO, scopes=SCOPES)
+    client = gspread.authorize(creds)
+    sheet = client.open_by_key(SPREADSHEET_ID).worksheet(SHEET_NAME)
 
 
 # Function to get the current date and time
@@ -43,7 +159,75 @@ def ensure_headers():
 ensure_headers()
 
 
+# Validation helpers: each returns the canonical value or raises ValueError with a message
+def parse_text(text):
+    text = " ".join(text.split())
+    if not text:
+        raise ValueError("This field can't be empty.")
+    return text
+
+
+def parse_date(text):
+    try:
+        date = datetime.strptime(text.strip(), "%d-%m-%Y")
+    except ValueError:
+        raise ValueError("Invalid date format. Please use DD-MM-YYYY.")
+    if date < EARLIEST_DATE or date > datetime.now():
+        raise ValueError(f"The date must be between {EARLIEST_DATE:%d-%m-%Y} and today.")
+    return date.strftime("%d-%m-%Y")
+
+
+def parse_hours(text):
+    try:
+        hours = float(text.strip().replace(",", "."))  # Accept both 2.5 and 2,5
+    except ValueError:
+        raise ValueError("Invalid number. Please enter hours such as 2 or 1.5.")
+    if not 0 < hours <= MAX_HOURS_PER_DAY:
+        raise ValueError(f"Hours must be more than 0 and at most {MAX_HOURS_PER_DAY}.")
+    return round(hours, 2)
+
+
+# Collaborator names already in the sheet, keyed by their case-insensitive form
+known_names = {}
+
+
+# Helper function to match a name against known collaborators, loading them once
+def canonical_name(name):
+    if not known_names:
+        try:
+            records, _ = load_records()
+        except Exception as e:
+            print(f"Could not load known collaborators: {e}")
+            records = []
+        for record in records:
+            known_names.setdefault(str(record['Name']).casefold(), str(record['Name']))
+    return known_names.get(name.casefold())
+
+
+# Helper function to keep asking until the answer passes validation
+def prompt_valid(prompt, parse):
+    while True:
+        try:
+            return parse(input(prompt))
+        except ValueError as e:
+            print(e)
+
+
 # Helper functions
+def get_name():
+    while True:
+        name = prompt_valid("Enter your name: ", parse_text)
+        known = canonical_name(name)
+        if known:
+            return known
+
+        # Unknown names are usually typos, so confirm before creating a new collaborator
+        confirm = input(f"'{name}' is a new collaborator. Is this correct? (y/n): ")
+        if confirm.strip().lower() == 'y':
+            known_names[name.casefold()] = name
+            return name
+
+
 def get_date():
     while True:
         date_input = input("Enter the date (DD-MM-YYYY) or press Enter to use today's date: ")
@@ -52,11 +236,9 @@ def get_date():
             return datetime.now().strftime("%d-%m-%Y")
 
         try:
-            # Validate and format the custom date
-            custom_date = datetime.strptime(date_input, "%d-%m-%Y")
-            return custom_date.strftime("%d-%m-%Y")
-        except ValueError:
-            print("Invalid date format. Please use DD-MM-YYYY.")
+            return parse_date(date_input)
+        except ValueError as e:
+            print(e)
 
 
 def select_task_type():
@@ -79,19 +261,27 @@ def select_task_type():
 
 # Function to log a new task entry
 def log_task():
-    name = input("Enter your name: ")
-    task = input("Enter the task: ")
+    name = get_name()  # Canonical spelling of a known collaborator
+    task = prompt_valid("Enter the task: ", parse_text)
     date = get_date()  # Function to get date (custom or current)
-    hours = float(input("Enter hours worked: "))
+    hours = prompt_valid("Enter hours worked: ", parse_hours)
     task_type = select_task_type()  # Function to select the task type
     recorded_at = get_current_datetime()  # Get the current date and time
 
     # Append data to the Google Sheet
     try:
+        load_records(max_age=0)  # Picks up entries from other sessions, so budget totals include them
         sheet.append_row([name, task, date, hours, task_type, recorded_at])
+        record_appended({
+            "Name": name, "Task": task, "Date": date, "Hours": hours,
+            "Type": task_type, "Recorded At": recorded_at,
+        })
         print("Task logged successfully.")
     except Exception as e:
         print(f"Error logging task: {e}")
+        return
+
+    check_budgets(date, [("types", task_type), ("collaborators", name)], hours)
 
 
 # Function to display all logged tasks
@@ -99,7 +289,7 @@ def view_logs():
     try:
         print("\nView Logs in Terminal:")
 
-        records = sheet.get_all_records()
+        records, _ = load_records()
         if not records:
             print("No logs available to view.")
             return
@@ -108,89 +298,200 @@ def view_logs():
         table.field_names = records[0].keys()
         for record in records:
             table.add_row(record.values())
-        print(table)
+
+        if SCREEN_MODE:
+            page_lines(table.get_string().splitlines(), header_rows=3, footer_rows=1)
+        else:
+            print(table)
 
     except Exception as e:
         print(f"Error viewing logs: {e}")
 
 
-# Helper function to filter tasks by the selected month
-def filter_tasks_by_month(records):
-    from datetime import datetime
-    import calendar
+# Lines currently shown on the terminal in screen mode, one per screen row
+screen_buffer = []
 
-    today = datetime.now()
 
-    months = []
-    for i in range(12):
-        month = (today.month - i - 1) % 12 + 1  # Handle month rollover
-        year = today.year if today.month - i > 0 else today.year - 1
-        months.append((calendar.month_name[month], month, year))
+# Function to draw a full screen of lines, sending only the rows that changed
+def draw_screen(lines):
+    if not screen_buffer:
+        screen_buffer.extend([None] * SCREEN_ROWS)
+        sys.stdout.write("\x1b[2J")  # First draw: start from a clear screen
+
+    output = []
+    for row in range(SCREEN_ROWS):
+        line = lines[row][:SCREEN_COLS] if row < len(lines) else ""
+        if screen_buffer[row] != line:
+            output.append(f"\x1b[{row + 1};1H{line}\x1b[K")  # Move to the row, write, clear the rest
+            screen_buffer[row] = line
+
+    sys.stdout.write("".join(output))
+    sys.stdout.flush()
+
+
+# Function to page long output inside the terminal window, keeping header and footer rows
+# (such as a table's borders) in view. Only the rows between them are counted and paged.
+def page_lines(lines, header_rows=0, footer_rows=0):
+    page_rows = SCREEN_ROWS - 2  # The last two rows hold the prompt and the Enter key's newline
+    if len(lines) <= page_rows:
+        print("\n".join(lines))
+        return
+
+    body_end = len(lines) - footer_rows
+    header, lines, footer = lines[:header_rows], lines[header_rows:body_end], lines[body_end:]
+    body_rows = page_rows - len(header) - len(footer)
+    top = 0
+    left = 0
+    widest = max(len(line) for line in header + lines + footer)
+    while True:
+        visible = [line[left:] for line in header + lines[top:top + body_rows] + footer]
+        status = (f"Rows {top + 1}-{min(top + body_rows, len(lines))} of {len(lines)} "
+                  "[Enter] next [p] prev [<>] scroll [q] quit: ")
+        draw_screen(visible + [""] * (page_rows - len(visible)) + [status])
+        sys.stdout.write(f"\x1b[{page_rows + 1};{len(status) + 1}H")
+        sys.stdout.flush()
+
+        choice = input().strip().lower()
+        screen_buffer[page_rows] = None  # The typed answer was echoed on the prompt row
+        screen_buffer[page_rows + 1] = None
+        if choice == 'q':
+            break
+        elif choice == 'p':
+            top = max(0, top - body_rows)
+        elif choice == '>':
+            left = min(left + SCREEN_COLS // 2, max(0, widest - SCREEN_COLS))
+        elif choice == '<':
+            left = max(0, left - SCREEN_COLS // 2)
+        elif top + body_rows < len(lines):
+            top += body_rows
+
+    # Leave screen mode with a clear screen for the menu
+    screen_buffer.clear()
+    sys.stdout.write("\x1b[2J\x1b[H")
+    sys.stdout.flush()
+
+
+# Helper function to read the hours of a stored record, counting unreadable values as 0
+def record_hours(record):
+    try:
+        return float(record['Hours'])
+    except (ValueError, TypeError):
+        return 0.0
+
+
+# Helper function to add one record to a month index
+def add_to_month_index(month_index, record, position):
+    try:
+        date = datetime.strptime(record['Date'], "%d-%m-%Y")
+        hours = float(record['Hours'])
+    except (ValueError, TypeError):
+        return  # Records with an unreadable date or hours can't be counted in a month
+
+    entry = month_index.setdefault((date.year, date.month), {
+        "count": 0, "hours": 0.0, "rows": [], "types": defaultdict(float), "collaborators": defaultdict(float),
+    })
+    entry["count"] += 1
+    entry["hours"] += hours
+    entry["rows"].append(position)
+    entry["types"][record['Type']] += hours
+    entry["collaborators"][record['Name']] += hours
 
-    months = months[::-1]
+
+# Helper function to index records by month: (year, month) -> count, hours, row positions
+# and hours per task type and per collaborator
+def build_month_index(records):
+    month_index = {}
+    for position, record in enumerate(records):
+        add_to_month_index(month_index, record, position)
+    return month_index
+
+
+# Helper function to let the user pick one of the months in a month index
+def select_month(month_index):
+    # Only offer months that actually have data, most recent last
+    months = sorted(month_index)[-MONTHS_SHOWN:]
+    if not months:
+        print("No records with a valid date found.")
+        return None, None
 
     print("\nFilter by Month:")
-    for idx, (month_name, _, _) in enumerate(months, start=1):
-        print(f"{idx}. {month_name}")
+    for idx, (year, month) in enumerate(months, start=1):
+        entry = month_index[(year, month)]
+        print(f"{idx}. {calendar.month_name[month]} {year} ({entry['count']} entries, {entry['hours']:.2f}h)")
 
     try:
         choice = int(input("Enter the number corresponding to your choice: ")) - 1
         if choice < 0 or choice >= len(months):
             print("Invalid choice.")
-            return [], None
+            return None, None
     except ValueError:
         print("Invalid input. Please enter a number.")
-        return [], None
+        return None, None
+
+    selected_year, selected_month = months[choice]
+    return months[choice], f"{calendar.month_name[selected_month]} {selected_year}"
+
+
+# Helper function to filter tasks by the selected month
+def filter_tasks_by_month(records, month_index=None):
+    if month_index is None:
+        month_index = build_month_index(records)
 
-    selected_month_name, selected_month, selected_year = months[choice]
-    filtered_records = [
-        record for record in records
-        if datetime.strptime(record['Date'], "%d-%m-%Y").month == selected_month and
-           datetime.strptime(record['Date'], "%d-%m-%Y").year == selected_year
-    ]
+    month_key, selected_month_name = select_month(month_index)
+    if month_key is None:
+        return [], None
 
+    filtered_records = [records[position] for position in month_index[month_key]["rows"]]
     return filtered_records, selected_month_name
 
 
+# Helper function to build a two-column table of hours
+def build_hours_table(data, title, headers):
+    table = PrettyTable()
+    table.title = title
+    table.field_names = headers
+    for key, value in data.items():
+        table.add_row([key, f"{value:.2f}h"])
+    return table
+
+
+# Helper function to print a two-column table of hours
+def generate_table(data, title, headers):
+    print(build_hours_table(data, title, headers))
+
+
+# Helper function to total the hours of some records per task type and per collaborator
+def summarise_records(records):
+    task_type_data = defaultdict(float)
+    collaborator_data = defaultdict(float)
+    total_hours = 0
+
+    for record in records:
+        task_type_data[record['Type']] += float(record['Hours'])
+        collaborator_data[record['Name']] += float(record['Hours'])
+        total_hours += float(record['Hours'])
+
+    return task_type_data, collaborator_data, total_hours
+
+
 # Function to display statistics in table format
-def display_statistics_table():
+def display_statistics_table(records=None, month_index=None):
     try:
-        records = sheet.get_all_records()
+        if records is None:
+            records, month_index = load_records()
 
         if not records:
             print("No logs found. Please log a task first.")
             return
 
-        filtered_records, selected_month_name = filter_tasks_by_month(records)
+        filtered_records, selected_month_name = filter_tasks_by_month(records, month_index)
 
         if not filtered_records:
             print(f"No records found for {selected_month_name}.")
             return
 
-        task_type_data = defaultdict(float)
-        collaborator_data = defaultdict(float)
-        monthly_data = defaultdict(float)
-
-        for record in records:
-            date = datetime.strptime(record["Date"], "%d-%m-%Y")
-            month_name = date.strftime("%B %Y")
-            monthly_data[month_name] += float(record["Hours"])
-
         # Calculate task type and collaborator hours for the selected month
-        selected_month_total_hours = 0  # Variable to track the total hours of the selected month
-
-        for record in filtered_records:
-            task_type_data[record['Type']] += float(record['Hours'])
-            collaborator_data[record['Name']] += float(record['Hours'])
-            selected_month_total_hours += float(record["Hours"])  # Add hours to the total for selected month
-
-        def generate_table(data, title, headers):
-            table = PrettyTable()
-            table.title = title
-            table.field_names = headers
-            for key, value in data.items():
-                table.add_row([key, f"{value:.2f}h"])
-            print(table)
+        task_type_data, collaborator_data, selected_month_total_hours = summarise_records(filtered_records)
 
         generate_table(task_type_data, f"Hours per Task Type for {selected_month_name}", ["Task Type", "Hours"])
         generate_table(collaborator_data, f"Hours by Collaborator for {selected_month_name}", ["Collaborator", "Hours"])
@@ -200,14 +501,684 @@ def display_statistics_table():
         print(f"Error displaying statistics: {e}")
 
 
+# Cached worksheets and records of every source, keyed by (spreadsheet id, sheet name).
+# Each cached entry holds the records, their month index, the header row and when the
+# sheet was last fully loaded and last checked for changes.
+worksheet_cache = {(SPREADSHEET_ID, SHEET_NAME): sheet}
+source_cache = {}
+
+
+# Function to fetch the records of one source, reusing a recent result if available
+def fetch_source(source):
+    return fetch_source_indexed(source)[0]
+
+
+# Function to fetch the records and month index of one source
+def fetch_source_indexed(source, max_age=CACHE_SECONDS):
+    key = (source['id'], source['sheet'])
+    cached = source_cache.get(key)
+    now = time.monotonic()
+    if cached and now - cached["checked_at"] < max_age:
+        return cached["records"], cached["month_index"]
+
+    worksheet = worksheet_cache.get(key)
+    if worksheet is None:
+        worksheet = client.open_by_key(source['id']).worksheet(source['sheet'])
+        worksheet_cache[key] = worksheet
+
+    # A small read around the cached end tells whether the sheet changed, so the
+    # full download is only needed when it did (or for the periodic full refresh)
+    if cached and now - cached["loaded_at"] < FULL_REFRESH_SECONDS:
+        new_records = fetch_new_rows(worksheet, cached)
+        if new_records is not None:
+            for record in new_records:
+                add_cached_record(cached, record)
+            cached["checked_at"] = now
+            return cached["records"], cached["month_index"]
+
+    records = worksheet.get_all_records()
+    month_index = build_month_index(records)
+    source_cache[key] = {
+        "records": records,
+        "month_index": month_index,
+        "header": list(records[0].keys()) if records else None,
+        "loaded_at": now,
+        "checked_at": now,
+    }
+    return records, month_index
+
+
+# Function to read only the rows appended after the cached ones. Returns None when the
+# last cached row no longer matches the sheet, meaning a full refetch is needed.
+def fetch_new_rows(worksheet, cached):
+    header = cached["header"]
+    if header is None:
+        return None  # Nothing cached to compare against, an empty sheet is cheap to reload
+
+    records = cached["records"]
+    last_row = len(records) + 1  # Sheet row of the last cached record, row 1 holds the headers
+    rows = worksheet.get(f"A{last_row}:{rowcol_to_a1(last_row + PROBE_ROWS, len(header))}")
+
+    def to_values(row):
+        return numericise_all(list(row) + [""] * (len(header) - len(row)))
+
+    expected = list(records[-1].values()) if records else header
+    if not rows or to_values(rows[0]) != expected:
+        return None
+
+    new_records = []
+    rows = rows[1:]
+    while True:
+        new_records.extend(dict(zip(header, to_values(row))) for row in rows)
+        if len(rows) < PROBE_ROWS:
+            return new_records
+
+        # A full window may mean more rows follow
+        start = last_row + len(new_records) + 1
+        rows = worksheet.get(f"A{start}:{rowcol_to_a1(start + PROBE_ROWS - 1, len(header))}")
+
+
+# Function to add one record to a cached source, keeping its indexes in step
+def add_cached_record(cached, record):
+    records = cached["records"]
+    records.append(record)
+    add_to_month_index(cached["month_index"], record, len(records) - 1)
+    if search_index["records"] is records:
+        add_to_search_index(record, len(records) - 1)
+    if cached["header"] is None:
+        cached["header"] = list(record.keys())
+
+
+# Function to load the records and month index of this program's own sheet
+def load_records(max_age=CACHE_SECONDS):
+    return fetch_source_indexed({"id": SPREADSHEET_ID, "sheet": SHEET_NAME}, max_age)
+
+
+# Function to keep the cached records and month index in step with a logged task
+def record_appended(record):
+    cached = source_cache.get((SPREADSHEET_ID, SHEET_NAME))
+    if cached:
+        add_cached_record(cached, record)
+
+
+# Function to fetch all sources concurrently and merge them into one dataset
+def fetch_all_sources():
+    merged = []
+    failures = []
+
+    # Every fetch runs at the same time, so the total wait is the slowest fetch
+    with ThreadPoolExecutor(max_workers=len(SOURCES)) as executor:
+        futures = [(source, executor.submit(fetch_source, source)) for source in SOURCES]
+
+        for source, future in futures:
+            try:
+                records = future.result()
+            except Exception as e:
+                failures.append((source['team'], e))
+                continue
+            for record in records:
+                merged.append(dict(record, Team=source['team']))
+
+    return merged, failures
+
+
+# Function to display statistics for all teams combined
+def display_company_statistics():
+    print("\nFetching data from all teams...")
+    records, failures = fetch_all_sources()
+
+    for team, error in failures:
+        print(f"Warning: could not load data for {team}: {error}")
+
+    if not records:
+        print("No logs found for any team.")
+        return
+
+    team_data = defaultdict(float)
+    for record in records:
+        team_data[record['Team']] += record_hours(record)
+
+    table = PrettyTable()
+    table.title = "Hours per Team (all time)"
+    table.field_names = ["Team", "Hours"]
+    for team, hours in team_data.items():
+        table.add_row([team, f"{hours:.2f}h"])
+    print(table)
+
+    if failures:
+        print(f"Totals exclude {len(failures)} of {len(SOURCES)} teams that failed to load.")
+
+    display_statistics_table(records)
+
+
+# State of the anomaly scan, kept so later scans only look at newly appended rows
+anomaly_scan = {
+    "records": None, "scanned": 0, "exact": {}, "near": {}, "daily_hours": defaultdict(float), "findings": [],
+}
+
+
+# Helper function to normalise free text so near duplicates compare equal
+def normalise_text(text):
+    return " ".join(re.findall(r"\w+", str(text).lower()))
+
+
+# Function to scan records for duplicates and impossible days in a single pass
+def scan_anomalies(records, state):
+    # The records were refetched or shrank, so earlier results may no longer line up
+    if state["records"] is not records or len(records) < state["scanned"]:
+        state.update(records=records, scanned=0, exact={}, near={}, daily_hours=defaultdict(float), findings=[])
+
+    findings = []
+    for position in range(state["scanned"], len(records)):
+        record = records[position]
+        row = position + 2  # Sheet row number, row 1 holds the headers
+
+        try:
+            hours = float(record['Hours'])
+        except (ValueError, TypeError):
+            findings.append((row, f"Hours value '{record['Hours']}' is not a number"))
+            continue
+
+        name = normalise_text(record['Name'])
+        date = str(record['Date']).strip()
+        exact_key = (str(record['Name']), str(record['Task']), str(record['Date']), hours)
+        near_key = (name, normalise_text(record['Task']), date, hours)
+
+        if exact_key in state["exact"]:
+            findings.append((row, f"Exact duplicate of row {state['exact'][exact_key]}"))
+        elif near_key in state["near"]:
+            findings.append((row, f"Near duplicate of row {state['near'][near_key]}"))
+        state["exact"].setdefault(exact_key, row)
+        state["near"].setdefault(near_key, row)
+
+        state["daily_hours"][(name, date)] += hours
+        day_total = state["daily_hours"][(name, date)]
+        if day_total > MAX_HOURS_PER_DAY:
+            findings.append((row, f"{record['Name']} has {day_total:.2f}h logged on {date}"))
+
+    state["scanned"] = len(records)
+    state["findings"].extend(findings)
+    return findings
+
+
+# Function to display duplicate entries and impossible days in the task log
+def display_anomalies():
+    try:
+        records, _ = load_records()
+        already_scanned = anomaly_scan["scanned"] if anomaly_scan["records"] is records else 0
+        new_findings = scan_anomalies(records, anomaly_scan)
+
+        print(f"\nScanned {len(records) - already_scanned} new rows, {len(new_findings)} new issues found.")
+        if not anomaly_scan["findings"]:
+            print("No duplicates or anomalies found.")
+            return
+
+        table = PrettyTable()
+        table.title = "Duplicates and Anomalies"
+        table.field_names = ["Row", "Issue"]
+        table.align["Issue"] = "l"
+        for row, issue in anomaly_scan["findings"]:
+            table.add_row([row, issue])
+        print(table)
+
+    except Exception as e:
+        print(f"Error checking for anomalies: {e}")
+
+
+# Function to read the monthly totals of archived entries
+def load_archive_summary():
+    if not os.path.exists(ARCHIVE_SUMMARY_FILE):
+        return {}
+    with open(ARCHIVE_SUMMARY_FILE) as f:
+        return json.load(f)
+
+
+# Function to move entries older than the horizon out of the live worksheet
+def archive_old_entries():
+    try:
+        months_input = input(f"Archive entries older than how many months? (Enter for {ARCHIVE_MONTHS}): ")
+        months_kept = int(months_input) if months_input.strip() else ARCHIVE_MONTHS
+        if months_kept < 1:
+            print("Please keep at least one month in the live sheet.")
+            return
+    except ValueError:
+        print("Invalid input. Please enter a number.")
+        return
+
+    try:
+        # Always work from a fresh read, the sheet is about to be rewritten
+        source_cache.pop((SPREADSHEET_ID, SHEET_NAME), None)
+        records, month_index = load_records()
+
+        today = datetime.now()
+        months_back = today.year * 12 + today.month - months_kept
+        cutoff = (months_back // 12, months_back % 12 + 1)  # First (year, month) kept live
+
+        old_positions = set()
+        for month_key, entry in month_index.items():
+            if month_key < cutoff:
+                old_positions.update(entry["rows"])
+
+        if not old_positions:
+            print(f"No entries dated before {calendar.month_name[cutoff[1]]} {cutoff[0]}.")
+            return
+
+        # Kept rows are written back as the sheet shows them: records have text turned into
+        # numbers, and unformatted values would turn typed dates into serials such as 45323
+        values = sheet.get_all_values(value_render_option="FORMATTED_VALUE")
+        if len(values) != len(records) + 1:
+            print("The sheet changed while archiving. Please try again.")
+            return
+
+        old_records = [records[position] for position in sorted(old_positions)]
+        kept_rows = [values[position + 1] for position in range(len(records))
+                     if position not in old_positions]
+
+        # Prepare the new archive beside the current one, it replaces it only once the
+        # sheet has been rewritten, so a failed run can be repeated without double counting
+        summary = load_archive_summary()
+        os.makedirs(ARCHIVE_DIR, exist_ok=True)
+        if os.path.exists(ARCHIVE_ENTRIES_FILE):
+            shutil.copyfile(ARCHIVE_ENTRIES_FILE, ARCHIVE_ENTRIES_FILE + ".tmp")
+        elif os.path.exists(ARCHIVE_ENTRIES_FILE + ".tmp"):
+            os.remove(ARCHIVE_ENTRIES_FILE + ".tmp")  # Left over from a failed run
+        with gzip.open(ARCHIVE_ENTRIES_FILE + ".tmp", "at") as f:
+            for record in old_records:
+                f.write(json.dumps(record) + "\n")
+                date = datetime.strptime(record['Date'], "%d-%m-%Y")
+                month = summary.setdefault(date.strftime("%Y-%m"), {
+                    "count": 0, "hours": 0.0, "types": {}, "collaborators": {},
+                })
+                hours = float(record['Hours'])
+                month["count"] += 1
+                month["hours"] += hours
+                month["types"][record['Type']] = month["types"].get(record['Type'], 0.0) + hours
+                month["collaborators"][record['Name']] = month["collaborators"].get(record['Name'], 0.0) + hours
+        with open(ARCHIVE_SUMMARY_FILE + ".tmp", "w") as f:
+            json.dump(summary, f, indent=2, sort_keys=True)
+
+        # Move the kept rows up in place, then drop the leftover rows at the bottom
+        try:
+            if kept_rows:
+                sheet.update("A2", kept_rows)
+            sheet.delete_rows(len(kept_rows) + 2, len(records) + 1)
+        finally:
+            source_cache.pop((SPREADSHEET_ID, SHEET_NAME), None)
+
+        os.replace(ARCHIVE_ENTRIES_FILE + ".tmp", ARCHIVE_ENTRIES_FILE)
+        os.replace(ARCHIVE_SUMMARY_FILE + ".tmp", ARCHIVE_SUMMARY_FILE)
+
+        print(f"Archived {len(old_records)} entries, {len(kept_rows)} remain in the live sheet.")
+
+    except Exception as e:
+        print(f"Error archiving entries: {e}")
+
+
+# Function to display the pre-summarised totals of archived months
+def display_archived_totals():
+    try:
+        summary = load_archive_summary()
+        if not summary:
+            print("No archived entries yet.")
+            return
+
+        months = sorted(summary)
+        print("\nArchived Months:")
+        for idx, month_key in enumerate(months, start=1):
+            month = summary[month_key]
+            month_name = datetime.strptime(month_key, "%Y-%m").strftime("%B %Y")
+            print(f"{idx}. {month_name} ({month['count']} entries, {month['hours']:.2f}h)")
+
+        try:
+            choice = int(input("Enter the number corresponding to your choice: ")) - 1
+            if choice < 0 or choice >= len(months):
+                print("Invalid choice.")
+                return
+        except ValueError:
+            print("Invalid input. Please enter a number.")
+            return
+
+        month = summary[months[choice]]
+        month_name = datetime.strptime(months[choice], "%Y-%m").strftime("%B %Y")
+        generate_table(month["types"], f"Hours per Task Type for {month_name}", ["Task Type", "Hours"])
+        generate_table(month["collaborators"], f"Hours by Collaborator for {month_name}", ["Collaborator", "Hours"])
+        print(f"\nTotal Hours for {month_name}: {month['hours']:.2f}h")
+
+    except Exception as e:
+        print(f"Error displaying archived totals: {e}")
+
+
+# Inverted index over the Task column: word -> row positions, plus the words in sorted
+# order for prefix lookups. It belongs to the cached records list it was built from.
+search_index = {"records": None, "postings": {}, "words": []}
+
+
+# Helper function to add one record to the search index
+def add_to_search_index(record, position):
+    for word in set(normalise_text(record['Task']).split()):
+        if word not in search_index["postings"]:
+            search_index["postings"][word] = []
+            insort(search_index["words"], word)
+        search_index["postings"][word].append(position)
+
+
+# Helper function to (re)build the search index when the cached records change
+def get_search_index(records):
+    if search_index["records"] is not records:
+        search_index.update(records=records, postings={}, words=[])
+        for position, record in enumerate(records):
+            add_to_search_index(record, position)
+    return search_index
+
+
+# Function to find the row positions whose Task contains every term, each as a word prefix
+def search_tasks(records, query):
+    index = get_search_index(records)
+    matches = None
+
+    for term in normalise_text(query).split():
+        term_matches = set()
+        start = bisect_left(index["words"], term)
+        for word in index["words"][start:]:
+            if not word.startswith(term):
+                break
+            term_matches.update(index["postings"][word])
+
+        matches = term_matches if matches is None else matches & term_matches
+        if not matches:
+            return []
+
+    return sorted(matches or [])
+
+
+# Function to search logged tasks by description
+def search_logs():
+    try:
+        query = input("Enter words to search for in the task descriptions: ")
+        if not normalise_text(query):
+            print("Please enter at least one word.")
+            return
+
+        records, month_index = load_records()
+        positions = search_tasks(records, query)
+
+        month_name = None
+        if positions and input("Limit the results to one month? (y/n): ").strip().lower() == 'y':
+            month_key, month_name = select_month(month_index)
+            if month_key is None:
+                return
+            month_rows = set(month_index[month_key]["rows"])
+            positions = [position for position in positions if position in month_rows]
+
+        where = f" in {month_name}" if month_name else ""
+        if not positions:
+            print(f"No tasks matching '{query}'{where}.")
+            return
+
+        table = PrettyTable()
+        table.title = f"Tasks matching '{query}'{where}"
+        table.field_names = ["Name", "Task", "Date", "Hours", "Type"]
+        total_hours = 0
+        for position in positions:
+            record = records[position]
+            table.add_row([record['Name'], record['Task'], record['Date'], record['Hours'], record['Type']])
+            total_hours += record_hours(record)
+        print(table)
+        print(f"\n{len(positions)} matching entries, {total_hours:.2f}h in total.")
+
+    except Exception as e:
+        print(f"Error searching logs: {e}")
+
+
+# Responses of the JSON API for the current data version, so repeated polls cost nothing
+api_cache = {"records": None, "count": None, "version": None, "responses": {}}
+api_lock = threading.Lock()
+
+
+# Function to build (or reuse) the JSON body and ETag of an API path
+def api_response(path, query):
+    records, month_index = load_records()
+
+    # A new records list or a logged task means the data may have changed
+    if api_cache["records"] is not records or api_cache["count"] != len(records):
+        version = hashlib.sha1(json.dumps(records, sort_keys=True).encode()).hexdigest()
+        if version != api_cache["version"]:
+            api_cache["responses"] = {}
+        api_cache.update(records=records, count=len(records), version=version)
+
+    key = (path, query.get("month", [None])[0] if path == "/statistics" else None)  # /logs has no month
+    if key not in api_cache["responses"]:
+        if path == "/logs":
+            body = {"records": records}
+        elif path == "/statistics" and key[1] is None:
+            body = {"months": {
+                f"{year}-{month:02d}": {"count": entry["count"], "hours": round(entry["hours"], 2)}
+                for (year, month), entry in sorted(month_index.items())
+            }}
+        elif path == "/statistics":
+            # Only real months are answered (and cached), so odd queries can't grow the cache
+            if not re.fullmatch(r"\d{4}-(0[1-9]|1[0-2])", key[1]):
+                return 400, {"error": "month must be given as YYYY-MM"}, None
+            month_key = (int(key[1][:4]), int(key[1][5:]))
+            positions = month_index.get(month_key, {"rows": []})["rows"]
+            task_type_data, collaborator_data, total_hours = summarise_records(
+                [records[position] for position in positions]
+            )
+            body = {
+                "month": key[1],
+                "types": task_type_data,
+                "collaborators": collaborator_data,
+                "total_hours": round(total_hours, 2),
+            }
+        else:
+            return 404, {"error": "unknown path, use /logs or /statistics[?month=YYYY-MM]"}, None
+
+        body["version"] = api_cache["version"]
+        api_cache["responses"][key] = json.dumps(body).encode()
+
+    return 200, api_cache["responses"][key], f'"{api_cache["version"]}"'
+
+
+# Request handler of the read-only statistics JSON API
+class ApiHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        try:
+            with api_lock:
+                status, body, etag = api_response(url.path.rstrip("/"), parse_qs(url.query))
+        except Exception as e:
+            status, body, etag = 500, {"error": str(e)}, None
+
+        if etag and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        if isinstance(body, dict):
+            body = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+# Function to serve the statistics JSON API until interrupted
+def serve_api(port):
+    server = ThreadingHTTPServer(("", port), ApiHandler)
+    print(f"Serving the statistics API on port {port}.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopping the statistics API.")
+    finally:
+        server.server_close()
+
+
+# Function to render one month's text, HTML and CSV reports (runs in a worker process)
+def render_month_report(month_key, records, output_dir):
+    year, month = month_key
+    month_name = f"{calendar.month_name[month]} {year}"
+    base_name = os.path.join(output_dir, f"report-{year}-{month:02d}")
+    task_type_data, collaborator_data, total_hours = summarise_records(records)
+    columns = ["Name", "Task", "Date", "Hours", "Type", "Recorded At"]
+
+    type_table = build_hours_table(task_type_data, f"Hours per Task Type for {month_name}", ["Task Type", "Hours"])
+    collaborator_table = build_hours_table(
+        collaborator_data, f"Hours by Collaborator for {month_name}", ["Collaborator", "Hours"]
+    )
+    with open(base_name + ".txt", "w") as f:
+        f.write(f"{type_table}\n{collaborator_table}\n\nTotal Hours for {month_name}: {total_hours:.2f}h\n")
+
+    with open(base_name + ".csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for record in records:
+            writer.writerow([record.get(column, "") for column in columns])
+
+    rows = "".join(
+        "<tr>" + "".join(f"<td>{html.escape(str(record.get(column, '')))}</td>" for column in columns) + "</tr>\n"
+        for record in records
+    )
+    header = "".join(f"<th>{column}</th>" for column in columns)
+    with open(base_name + ".html", "w") as f:
+        f.write(f"""<html>
+<head><title>Task Report - {month_name}</title></head>
+<body style="font-family: Arial, sans-serif;">
+<h1>Task Report for {month_name}</h1>
+{type_table.get_html_string()}
+{collaborator_table.get_html_string()}
+<h2>Task Details</h2>
+<table border="1" cellpadding="6" style="border-collapse: collapse;">
+<thead><tr>{header}</tr></thead>
+<tbody>
+{rows}</tbody>
+</table>
+<p><strong>Total Hours: {total_hours:.2f}h</strong></p>
+</body>
+</html>
+""")
+
+    return {
+        "month": f"{year}-{month:02d}",
+        "entries": len(records),
+        "hours": round(total_hours, 2),
+        "files": [os.path.basename(base_name) + extension for extension in (".txt", ".html", ".csv")],
+    }
+
+
+# Function to render the reports of many months in parallel worker processes
+def generate_reports(month_args, output_dir=REPORTS_DIR):
+    records, month_index = load_records()  # Loaded once and shared out by month
+
+    if month_args:
+        try:
+            months = [tuple(int(part) for part in arg.split("-")) for arg in month_args]
+            if any(len(month_key) != 2 for month_key in months):
+                raise ValueError
+        except ValueError:
+            print("Months must be given as YYYY-MM.")
+            return
+    else:
+        months = sorted(month_index)[-MONTHS_SHOWN:]
+
+    missing = [f"{year}-{month:02d}" for year, month in months if (year, month) not in month_index]
+    if missing:
+        print(f"No records found for {', '.join(missing)}.")
+    months = [month_key for month_key in months if month_key in month_index]
+    if not months:
+        return
+
+    os.makedirs(output_dir, exist_ok=True)
+    # Fork so workers reuse the loaded module instead of re-importing (and re-authorising) it
+    with ProcessPoolExecutor(mp_context=multiprocessing.get_context("fork")) as executor:
+        futures = [
+            executor.submit(
+                render_month_report, month_key,
+                [records[position] for position in month_index[month_key]["rows"]], output_dir,
+            )
+            for month_key in months
+        ]
+        reports = [future.result() for future in futures]
+
+    with open(os.path.join(output_dir, "manifest.json"), "w") as f:
+        json.dump({"generated_at": get_current_datetime(), "reports": reports}, f, indent=2)
+
+    print(f"Generated {len(reports)} monthly reports in {output_dir}.")
+
+
+# Function to warn when a logged entry pushes a monthly budget past a threshold.
+# Uses the running totals of the cached month index, so it never reads the sheet.
+def check_budgets(date, keys, hours):
+    cached = source_cache.get((SPREADSHEET_ID, SHEET_NAME))
+    if not cached or not BUDGETS:
+        return
+
+    date = datetime.strptime(date, "%d-%m-%Y")
+    entry = cached["month_index"].get((date.year, date.month))
+    if entry is None:
+        return
+
+    for group, key in keys:
+        budget = BUDGETS.get(group, {}).get(key)
+        if not budget:
+            continue
+        used = entry[group][key]
+        before = used - hours
+        month_name = date.strftime("%B %Y")
+        if before <= budget < used:
+            print(f"Warning: {key} is over the {budget}h budget for {month_name} ({used:.2f}h used).")
+        elif before < budget * BUDGET_WARNING <= used:
+            print(f"Warning: {key} has used {used / budget:.0%} of the {budget}h budget for {month_name}.")
+
+
+# Function to display budgets against actual hours for a month
+def display_budget_report():
+    try:
+        if not BUDGETS:
+            print("No budgets configured. Set the 'budgets' environment variable.")
+            return
+
+        _, month_index = load_records()
+        month_key, month_name = select_month(month_index)
+        if month_key is None:
+            return
+
+        entry = month_index[month_key]
+        table = PrettyTable()
+        table.title = f"Budget vs Actual for {month_name}"
+        table.field_names = ["Budget For", "Budget", "Actual", "Used"]
+        for group in ("types", "collaborators"):
+            for key, budget in BUDGETS.get(group, {}).items():
+                used = entry[group].get(key, 0.0)
+                if not budget:
+                    table.add_row([key, f"{budget:.2f}h", f"{used:.2f}h", "n/a"])
+                    continue
+                flag = " !" if used > budget else ""
+                table.add_row([key, f"{budget:.2f}h", f"{used:.2f}h", f"{used / budget:.0%}{flag}"])
+        print(table)
+
+    except Exception as e:
+        print(f"Error displaying budget report: {e}")
+
+
 # Main function to display the menu and execute chosen options
 def main():
     while True:
         print("\nOptions:")
         print("1. Log Task")
         print("2. View Logs")
-        print("3. View Statistics")
-        print("4. Exit")
+        print("3. Search Logs")
+        print("4. View Statistics")
+        print("5. View Company Statistics")
+        print("6. View Budget Report")
+        print("7. Check for Duplicates")
+        print("8. View Archived Totals")
+        print("9. Archive Old Entries")
+        print("10. Exit")
 
         choice = input("Choose an option: ")
         if choice == '1':
@@ -215,8 +1186,20 @@ def main():
         elif choice == '2':
             view_logs()
         elif choice == '3':
-            display_statistics_table()
+            search_logs()
         elif choice == '4':
+            display_statistics_table()
+        elif choice == '5':
+            display_company_statistics()
+        elif choice == '6':
+            display_budget_report()
+        elif choice == '7':
+            display_anomalies()
+        elif choice == '8':
+            display_archived_totals()
+        elif choice == '9':
+            archive_old_entries()
+        elif choice == '10':
             print("Exiting program.")
             break
         else:
@@ -224,4 +1207,9 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        serve_api(int(sys.argv[2]) if len(sys.argv) > 2 else API_PORT)
+    elif len(sys.argv) > 1 and sys.argv[1] == "reports":
+        generate_reports(sys.argv[2:])
+    else:
+        main()
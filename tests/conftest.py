@@ -0,0 +1,43 @@
+import importlib
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+import pytest
+
+# run.py opens its sheet when imported, so point it at a local stand-in before that happens
+SHEET_FILE = os.path.join(tempfile.mkdtemp(prefix="worktracking-tests-"), "sheet.json")
+os.environ["local_sheet"] = SHEET_FILE
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HEADERS = ["Name", "Task", "Date", "Hours", "Type", "Recorded At"]
+TODAY = datetime.now().strftime("%d-%m-%Y")
+
+
+def entry(name="Anna", task="Invoice for client", date=TODAY, hours=2, task_type="Product"):
+    return [name, task, date, hours, task_type, "01-01-2024 09:00:00"]
+
+
+def record(**fields):
+    return dict(zip(HEADERS, entry(**fields)))
+
+
+@pytest.fixture(scope="session")
+def run():
+    return importlib.import_module("run")  # Prints the welcome line and adds the headers
+
+
+@pytest.fixture
+def sheet(run):
+    """Returns a function that fills the local sheet with rows and clears every cache."""
+    def fill(rows):
+        with open(SHEET_FILE, "w") as f:
+            json.dump([HEADERS] + [list(row) for row in rows], f)
+        run.source_cache.clear()
+        run.known_names.clear()
+        run.search_index.update(records=None, postings={}, words=[])
+        run.api_cache.update(records=None, count=None, version=None, responses={})
+        return run.sheet
+    return fill
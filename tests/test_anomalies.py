@@ -0,0 +1,40 @@
+from conftest import TODAY, entry
+
+
+def new_scan():
+    return {"records": None, "scanned": 0}  # The first scan resets the rest of the state
+
+
+def test_scan_flags_duplicates_overages_and_bad_hours(run, sheet):
+    sheet([
+        entry(task="Invoice client", hours=10),
+        entry(task="Invoice client", hours=10),
+        entry(task="invoice,  CLIENT!", hours=10),
+        entry(hours="two"),
+    ])
+    records, _ = run.load_records()
+
+    findings = run.scan_anomalies(records, new_scan())
+
+    assert findings == [
+        (3, "Exact duplicate of row 2"),
+        (4, "Near duplicate of row 2"),
+        (4, f"Anna has 30.00h logged on {TODAY}"),
+        (5, "Hours value 'two' is not a number"),
+    ]
+
+
+def test_scan_only_checks_new_rows_until_records_are_replaced(run, sheet):
+    sheet([entry(task="A"), entry(task="A")])
+    records, _ = run.load_records()
+    state = new_scan()
+    assert len(run.scan_anomalies(records, state)) == 1
+
+    records.append(dict(records[0], Task="B"))
+
+    assert run.scan_anomalies(records, state) == []
+    assert state["scanned"] == 3
+
+    refetched = [dict(record) for record in records]
+    assert run.scan_anomalies(refetched, state) == [(3, "Exact duplicate of row 2")]
+    assert len(state["findings"]) == 1
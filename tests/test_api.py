@@ -0,0 +1,72 @@
+from datetime import datetime
+from http.server import ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+import threading
+
+import pytest
+
+from conftest import entry, record
+
+THIS_MONTH = datetime.now().strftime("%Y-%m")
+
+
+@pytest.fixture
+def api(run):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), run.ApiHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def get(url, etag=None):
+    request = Request(url, headers={"If-None-Match": etag} if etag else {})
+    try:
+        with urlopen(request) as response:
+            return response.status, response.headers.get("ETag"), response.read()
+    except HTTPError as e:
+        return e.code, e.headers.get("ETag"), e.read()
+
+
+def test_api_returns_statistics_with_an_etag(run, sheet, api):
+    sheet([entry(name="Anna", hours=2), entry(name="Marco", hours=3, task_type="Marketing")])
+
+    status, etag, body = get(f"{api}/statistics?month={THIS_MONTH}")
+
+    assert status == 200
+    assert etag
+    assert b'"total_hours": 5.0' in body
+
+
+def test_api_returns_304_for_a_matching_etag(run, sheet, api):
+    sheet([entry()])
+    _, etag, _ = get(f"{api}/logs")
+
+    status, _, body = get(f"{api}/logs", etag)
+
+    assert status == 304
+    assert body == b""
+
+
+def test_api_rejects_bad_months_and_unknown_paths(run, sheet, api):
+    sheet([entry()])
+
+    for month in ["x", "2024-13", "2024-00", "2024", "1-2-3", "2024-1", "2024-01-01"]:
+        assert get(f"{api}/statistics?month={month}")[0] == 400
+    assert get(f"{api}/logs?month=x")[0] == 200
+    assert list(run.api_cache["responses"]) == [("/logs", None)]
+    assert get(f"{api}/nope")[0] == 404
+
+
+def test_api_etag_changes_when_a_task_is_logged(run, sheet, api):
+    sheet([entry()])
+    _, etag, _ = get(f"{api}/logs")
+
+    run.sheet.append_row(entry(task="Another"))
+    run.record_appended(record(task="Another"))
+    status, new_etag, body = get(f"{api}/logs", etag)
+
+    assert status == 200
+    assert new_etag != etag
+    assert b"Another" in body
@@ -0,0 +1,85 @@
+import gzip
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+from conftest import HEADERS, entry
+
+
+def months_ago(months):
+    today = datetime.now()
+    months_back = today.year * 12 + today.month - 1 - months
+    return f"01-{months_back % 12 + 1:02d}-{months_back // 12}"
+
+
+@pytest.fixture
+def archive(run, tmp_path, monkeypatch):
+    """Runs the archive in a temporary directory, keeping the last 12 months."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("builtins.input", lambda prompt="": "12")
+    return run.archive_old_entries
+
+
+def archived_entries(run):
+    with gzip.open(run.ARCHIVE_ENTRIES_FILE, "rt") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_entries_before_the_cutoff_month_are_archived_and_summarised(run, sheet, archive):
+    old, cutoff = months_ago(12), months_ago(11)  # The last 12 months are kept, this one included
+    local = sheet([
+        entry(name="Anna", task="Old invoice", date=old, hours=2),
+        entry(name="Marco", task="Kept", date=cutoff, hours=3),
+        entry(name="Anna", task="Old post", date=old, hours=1.5, task_type="Marketing"),
+    ])
+
+    archive()
+
+    assert local.get_all_values() == [HEADERS, entry(name="Marco", task="Kept", date=cutoff, hours=3)]
+    assert [record["Task"] for record in archived_entries(run)] == ["Old invoice", "Old post"]
+    assert run.load_archive_summary() == {
+        datetime.strptime(old, "%d-%m-%Y").strftime("%Y-%m"): {
+            "count": 2, "hours": 3.5, "types": {"Product": 2.0, "Marketing": 1.5}, "collaborators": {"Anna": 3.5},
+        }
+    }
+
+
+def test_archiving_again_does_not_double_count(run, sheet, archive, capsys):
+    sheet([entry(date=months_ago(12)), entry(date=months_ago(1))])
+    archive()
+    summary = run.load_archive_summary()
+
+    archive()
+
+    assert "No entries dated before" in capsys.readouterr().out
+    assert run.load_archive_summary() == summary
+    assert len(archived_entries(run)) == 1
+
+
+def test_failed_sheet_rewrite_leaves_the_archive_untouched(run, sheet, archive, monkeypatch):
+    local = sheet([entry(date=months_ago(12)), entry(date=months_ago(1))])
+    with monkeypatch.context() as m:
+        m.setattr(local, "update", lambda *args: 1 / 0)
+        archive()
+
+    assert not os.path.exists(run.ARCHIVE_SUMMARY_FILE)
+    assert len(local.get_all_values()) == 3
+
+    archive()
+
+    old_month = datetime.strptime(months_ago(12), "%d-%m-%Y").strftime("%Y-%m")
+    assert run.load_archive_summary()[old_month]["count"] == 1
+    assert len(archived_entries(run)) == 1
+
+
+def test_kept_rows_are_read_as_the_sheet_shows_them(run, sheet, archive, monkeypatch):
+    local = sheet([entry(date=months_ago(12)), entry(date=months_ago(1))])
+    read_options = []
+    get_all_values = local.get_all_values
+    monkeypatch.setattr(local, "get_all_values", lambda **kwargs: read_options.append(kwargs) or get_all_values())
+
+    archive()
+
+    assert read_options == [{"value_render_option": "FORMATTED_VALUE"}]
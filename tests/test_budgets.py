@@ -0,0 +1,54 @@
+from datetime import datetime
+
+import pytest
+
+from conftest import TODAY, entry, record
+
+
+@pytest.fixture
+def log(run, capsys, monkeypatch):
+    """Returns a function that logs Product hours for Anna and returns the budget warnings."""
+    monkeypatch.setattr(run, "BUDGETS", {"types": {"Product": 10}, "collaborators": {"Anna": 100}})
+
+    def log_hours(hours):
+        run.record_appended(record(hours=hours))
+        run.check_budgets(TODAY, [("types", "Product"), ("collaborators", "Anna")], hours)
+        return capsys.readouterr().out
+    return log_hours
+
+
+def test_budget_warnings_are_shown_once_per_threshold(run, sheet, log):
+    sheet([entry(hours=7)])
+    run.load_records()
+
+    assert log(0.5) == ""
+    assert log(1) == f"Warning: Product has used 85% of the 10h budget for {datetime.now():%B %Y}.\n"
+    assert log(0.5) == ""
+    assert "Product is over the 10h budget" in log(2)
+    assert log(1) == ""
+
+
+
+def test_logging_a_task_counts_entries_from_other_sessions(run, sheet, monkeypatch, capsys):
+    monkeypatch.setattr(run, "BUDGETS", {"types": {"Product": 10}})
+    local = sheet([entry(hours=7)])
+    run.load_records()
+    local.append_row(entry(name="Marco", hours=0.5))  # Logged by another session
+
+    answers = iter(["Anna", "Budget check", "", "1", "3"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    run.log_task()
+
+    assert f"Product has used 85% of the 10h budget for {datetime.now():%B %Y}." in capsys.readouterr().out
+
+
+def test_budget_report_shows_zero_budgets_as_not_applicable(run, sheet, monkeypatch, capsys):
+    monkeypatch.setattr(run, "BUDGETS", {"types": {"Product": 0, "Marketing": 4}})
+    monkeypatch.setattr("builtins.input", lambda prompt="": "1")
+    sheet([entry(hours=2, task_type="Product"), entry(hours=3, task_type="Marketing")])
+
+    run.display_budget_report()
+
+    rows = [line for line in capsys.readouterr().out.splitlines() if "Product" in line or "Marketing" in line]
+    assert "n/a" in rows[0]
+    assert "75%" in rows[1]
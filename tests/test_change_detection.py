@@ -0,0 +1,47 @@
+from datetime import datetime
+
+import pytest
+
+from conftest import entry
+
+
+def expire_cache(run):
+    run.source_cache[(run.SPREADSHEET_ID, run.SHEET_NAME)]["checked_at"] -= run.CACHE_SECONDS + 1
+
+
+def test_appended_rows_are_fetched_without_a_full_reload(run, sheet, monkeypatch):
+    local = sheet([entry(task=f"Task {i}") for i in range(3)])
+    records, _ = run.load_records()
+    for i in range(run.PROBE_ROWS + 5):
+        local.append_row(entry(task=f"New {i}"))
+
+    monkeypatch.setattr(local, "get_all_records", lambda: pytest.fail("full reload"))
+    expire_cache(run)
+    refreshed, month_index = run.load_records()
+
+    assert refreshed is records
+    assert len(records) == run.PROBE_ROWS + 8
+    assert records[-1]["Task"] == f"New {run.PROBE_ROWS + 4}"
+    assert month_index[(datetime.now().year, datetime.now().month)]["count"] == len(records)
+
+
+def test_unchanged_sheet_keeps_the_cached_records(run, sheet):
+    sheet([entry()])
+    records, _ = run.load_records()
+
+    expire_cache(run)
+
+    assert run.load_records()[0] is records
+    assert len(records) == 1
+
+
+def test_changed_last_row_triggers_a_full_reload(run, sheet):
+    local = sheet([entry(task="First"), entry(task="Last")])
+    records, _ = run.load_records()
+    local.update("A3", [entry(task="Edited")])
+
+    expire_cache(run)
+    refreshed, _ = run.load_records()
+
+    assert refreshed is not records
+    assert refreshed[-1]["Task"] == "Edited"
@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from conftest import entry, record
+
+
+def test_month_index_counts_entries_hours_and_rows(run, sheet):
+    sheet([entry(date="05-01-2024", hours=2), entry(date="03-02-2024", hours=4), entry(date="20-01-2024", hours=1.5)])
+
+    records, month_index = run.load_records()
+
+    assert {key: (value["count"], value["hours"], value["rows"]) for key, value in month_index.items()} == {
+        (2024, 1): (2, 3.5, [0, 2]),
+        (2024, 2): (1, 4.0, [1]),
+    }
+
+
+def test_logged_task_updates_the_cached_month_index(run, sheet):
+    sheet([entry(date="05-01-2024", hours=2)])
+    records, month_index = run.load_records()
+
+    run.record_appended(record(date="06-01-2024", hours=3))
+
+    assert len(records) == 2
+    assert (month_index[(2024, 1)]["count"], month_index[(2024, 1)]["hours"]) == (2, 5.0)
+    assert month_index[(2024, 1)]["rows"] == [0, 1]
+
+
+def test_month_index_skips_rows_with_unreadable_hours_or_dates(run, sheet):
+    sheet([entry(hours=2), entry(hours=""), entry(hours="two"), entry(date="not a date")])
+
+    records, month_index = run.load_records()
+
+    assert len(records) == 4
+    assert [(key, value["count"], value["hours"]) for key, value in month_index.items()] == [
+        ((datetime.now().year, datetime.now().month), 1, 2.0)
+    ]
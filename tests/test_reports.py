@@ -0,0 +1,32 @@
+import json
+
+from conftest import entry
+
+
+def test_reports_are_written_per_month_with_a_manifest(run, sheet, tmp_path):
+    sheet([
+        entry(name="Anna", date="05-01-2024", hours=2),
+        entry(name="Marco", date="06-01-2024", hours=3),
+        entry(name="Anna", date="03-02-2024", hours=4),
+    ])
+
+    run.generate_reports(["2024-01", "2024-02", "2023-05"], str(tmp_path))
+
+    with open(tmp_path / "manifest.json") as f:
+        reports = json.load(f)["reports"]
+    assert [(report["month"], report["entries"], report["hours"]) for report in reports] == [
+        ("2024-01", 2, 5.0), ("2024-02", 1, 4.0),
+    ]
+    assert reports[0]["files"] == ["report-2024-01.txt", "report-2024-01.html", "report-2024-01.csv"]
+    assert "Total Hours for January 2024: 5.00h" in (tmp_path / "report-2024-01.txt").read_text()
+    assert len((tmp_path / "report-2024-01.csv").read_text().splitlines()) == 3
+    assert "<td>Marco</td>" in (tmp_path / "report-2024-01.html").read_text()
+
+
+def test_badly_formatted_months_are_rejected(run, sheet, tmp_path, capsys):
+    sheet([entry(date="05-01-2024")])
+
+    run.generate_reports(["2024"], str(tmp_path))
+
+    assert "Months must be given as YYYY-MM." in capsys.readouterr().out
+    assert not (tmp_path / "manifest.json").exists()
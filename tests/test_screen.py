@@ -0,0 +1,50 @@
+import pytest
+
+
+@pytest.fixture
+def screen(run, monkeypatch):
+    monkeypatch.setattr(run, "screen_buffer", [])
+    return run.draw_screen
+
+
+def test_first_draw_clears_the_screen_and_writes_every_row(run, screen, capsys):
+    screen(["Title", "Row"])
+
+    output = capsys.readouterr().out
+    assert output.startswith("\x1b[2J\x1b[1;1HTitle\x1b[K\x1b[2;1HRow\x1b[K")
+    assert output.count("\x1b[K") == run.SCREEN_ROWS
+
+
+def test_redraw_only_writes_the_rows_that_changed(run, screen, capsys):
+    lines = [f"Row {row}" for row in range(run.SCREEN_ROWS)]
+    screen(lines)
+    capsys.readouterr()
+
+    lines[5] = "Changed"
+    screen(lines)
+    assert capsys.readouterr().out == "\x1b[6;1HChanged\x1b[K"
+
+    screen(lines)
+    assert capsys.readouterr().out == ""
+
+
+def test_rows_are_cut_at_the_screen_width(run, screen, capsys):
+    screen(["x" * (run.SCREEN_COLS + 20)])
+
+    assert f"\x1b[1;1H{'x' * run.SCREEN_COLS}\x1b[K" in capsys.readouterr().out
+
+
+def test_pager_counts_only_the_rows_between_header_and_footer(run, monkeypatch, capsys):
+    monkeypatch.setattr(run, "screen_buffer", [])
+    table = run.PrettyTable(["Task"])
+    for row in range(60):
+        table.add_row([f"Task {row}"])
+    lines = table.get_string().splitlines()
+    monkeypatch.setattr("builtins.input", lambda prompt="": "q")
+
+    run.page_lines(lines, header_rows=3, footer_rows=1)
+
+    output = capsys.readouterr().out
+    body_rows = run.SCREEN_ROWS - 2 - 3 - 1
+    assert f"Rows 1-{body_rows} of 60 " in output
+    assert f"\x1b[{3 + body_rows + 1};1H{lines[-1]}\x1b[K" in output  # The bottom border closes the page
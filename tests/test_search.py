@@ -0,0 +1,24 @@
+from conftest import entry, record
+
+
+def test_search_matches_word_prefixes_and_requires_every_term(run, sheet):
+    sheet([
+        entry(task="Invoice for client Rossi"),
+        entry(task="Client meeting"),
+        entry(task="Invoices overdue"),
+    ])
+    records, _ = run.load_records()
+
+    assert run.search_tasks(records, "inv") == [0, 2]
+    assert run.search_tasks(records, "CLIENT inv") == [0]
+    assert run.search_tasks(records, "zebra") == []
+
+
+def test_search_index_follows_logged_tasks(run, sheet):
+    sheet([entry(task="Newsletter draft")])
+    records, _ = run.load_records()
+    run.search_tasks(records, "news")
+
+    run.record_appended(record(task="News post"))
+
+    assert run.search_tasks(records, "news") == [0, 1]
@@ -0,0 +1,33 @@
+import pytest
+
+from conftest import HEADERS, entry
+
+
+def test_sources_are_merged_and_failed_sources_reported(run, sheet, tmp_path, monkeypatch):
+    sheet([entry(name="Anna", hours=2)])
+    sales = run.LocalSheet(str(tmp_path / "sales.json"))
+    sales.append_row(HEADERS)
+    sales.append_row(entry(name="Marco", hours=3))
+    monkeypatch.setattr(run, "SOURCES", [
+        {"team": "Main", "id": run.SPREADSHEET_ID, "sheet": run.SHEET_NAME},
+        {"team": "Sales", "id": "sales", "sheet": "Foglio1"},
+        {"team": "Broken", "id": "missing", "sheet": "Foglio1"},  # Can't be opened without a client
+    ])
+    monkeypatch.setitem(run.worksheet_cache, ("sales", "Foglio1"), sales)
+
+    records, failures = run.fetch_all_sources()
+
+    assert [(record["Team"], record["Name"], record["Hours"]) for record in records] == [
+        ("Main", "Anna", 2), ("Sales", "Marco", 3),
+    ]
+    assert [team for team, _ in failures] == ["Broken"]
+
+
+def test_recent_fetches_are_reused(run, sheet, monkeypatch):
+    local = sheet([entry()])
+    source = {"team": "Main", "id": run.SPREADSHEET_ID, "sheet": run.SHEET_NAME}
+    records = run.fetch_source(source)
+
+    monkeypatch.setattr(local, "get_all_records", lambda: pytest.fail("refetched"))
+
+    assert run.fetch_source(source) is records
@@ -0,0 +1,26 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+
+def test_parse_hours_accepts_decimal_comma_and_rounds(run):
+    assert run.parse_hours(" 2,5 ") == 2.5
+    assert run.parse_hours("1.234") == 1.23
+
+
+@pytest.mark.parametrize("text", ["", "abc", "0", "-1", "24.5"])
+def test_parse_hours_rejects_invalid_values(run, text):
+    with pytest.raises(ValueError):
+        run.parse_hours(text)
+
+
+def test_parse_date_normalises_valid_dates(run):
+    assert run.parse_date(" 1-2-2024 ") == "01-02-2024"
+
+
+@pytest.mark.parametrize("text", [
+    "31-02-2024", "2024-02-01", "31-12-1999", (datetime.now() + timedelta(days=1)).strftime("%d-%m-%Y"),
+])
+def test_parse_date_rejects_invalid_or_out_of_range_dates(run, text):
+    with pytest.raises(ValueError):
+        run.parse_date(text)